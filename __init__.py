@@ -75,9 +75,10 @@ class AttributesWidget(QWidget):
             envUI = self.mainWindow.getEnvUI()
             Module.env = envUI # update environment for runtime modules
 
-            localEnv = dict(envUI)
-            localEnv.update(self.moduleItem.module.getEnv())
-            localEnv.update(env or {})
+            localEnv = {**envUI, **self.moduleItem.module.getEnv(), **(env or {})} # one merge per command
+
+            if not cmd: # words probe, nothing to execute
+                return localEnv
 
             with captureOutput(self.mainWindow.logWidget):
                 try:
@@ -86,9 +87,8 @@ class AttributesWidget(QWidget):
                     print("Error: "+str(e))
                     self.mainWindow.showLog()
                 else:
-                    if cmd: # in case command is specified, no command can be used for obtaining completions
-                        self.updateWidgets()
-                        self.updateWidgetStyles()
+                    self.updateWidgets()
+                    self.updateWidgetStyles()
             return localEnv
 
         for idx, a in enumerate(attributes):
@@ -114,15 +114,17 @@ class AttributesWidget(QWidget):
 
     def connectionMenu(self, menu, module, attrWidgetIndex, path="/"):
         attr, _, _ = self._attributeAndWidgets[attrWidgetIndex]
+        template = attr.template() # looked up once, compared against every attribute of the hierarchy
+        modulePath = path+module.name()+"/"
 
         subMenu = QMenu(module.name())
 
         for a in module.attributes():
-            if a.template() == attr.template() and a.name(): # skip empty names as well
-                subMenu.addAction(a.name(), Callback(self.connectAttr, path+module.name()+"/"+a.name(), attrWidgetIndex))
+            if a.template() == template and a.name(): # skip empty names as well
+                subMenu.addAction(a.name(), Callback(self.connectAttr, modulePath+a.name(), attrWidgetIndex))
 
         for ch in module.children():
-            self.connectionMenu(subMenu, ch, attrWidgetIndex, path+module.name()+"/")
+            self.connectionMenu(subMenu, ch, attrWidgetIndex, modulePath)
 
         if subMenu.actions():
             menu.addMenu(subMenu)
@@ -135,8 +137,9 @@ class AttributesWidget(QWidget):
         if self.moduleItem and self.moduleItem.parent():
             makeConnectionMenu = menu.addMenu("Make connection")
 
+            template = attr.template()
             for a in self.moduleItem.module.parent().attributes():
-                if a.template() == attr.template() and a.name(): # skip empty names as well
+                if a.template() == template and a.name(): # skip empty names as well
                     makeConnectionMenu.addAction(a.name(), Callback(self.connectAttr, "/"+a.name(), attrWidgetIndex))
 
             for ch in self.moduleItem.module.parent().children():
@@ -215,6 +218,10 @@ class AttributesWidget(QWidget):
         for i in range(len(self._attributeAndWidgets)):
             self.updateWidget(i)
 
+    def flushChanges(self): # write pending widget changes to the attributes
+        for _, _, widget in self._attributeAndWidgets:
+            widget.flushChange()
+
     def updateWidgetStyle(self, attrWidgetIndex):
         attr, nameWidget, widget = self._attributeAndWidgets[attrWidgetIndex]
 
@@ -298,9 +305,8 @@ class AttributesWidget(QWidget):
     def resetAttr(self, attrWidgetIndex):
         attr, _, _ = self._attributeAndWidgets[attrWidgetIndex]
 
-        tmp = widgets.TemplateWidgets[attr.template()]()
         attr.setConnect("")
-        attr.setData(tmp.getDefaultData())
+        attr.setData(widgets.templateDefaultData(attr.template()))
         self.updateWidget(attrWidgetIndex)
         self.updateWidgetStyle(attrWidgetIndex)
 
@@ -373,6 +379,9 @@ class AttributesTabWidget(QTabWidget):
 
         idx = clamp(idx, 0, self.count()-1)
 
+        if self._attributesWidget:
+            self._attributesWidget.flushChanges()
+
         title = self.tabText(idx)
         scrollArea = self.widget(idx)
         self._attributesWidget = AttributesWidget(self.moduleItem, self.tabsAttributes[title], mainWindow=self.mainWindow)
@@ -383,6 +392,8 @@ class AttributesTabWidget(QTabWidget):
         oldIndex = self.currentIndex()
         oldCount = self.count()
 
+        if self._attributesWidget: # the old widgets are deleted below
+            self._attributesWidget.flushChanges()
         self._attributesWidget = None
         self.tabsAttributes.clear()
 
@@ -5,7 +5,7 @@ import glob
 import json
 import uuid
 import xml.etree.ElementTree as ET
-from .utils import copyJson
+from .utils import copyJson, jsonLoads
 
 ModulesAPI = {} # updated at the end
 
@@ -248,7 +248,7 @@ class Attribute(object):
         attr._template = root.attrib["template"]
         attr._category = root.attrib["category"]
         attr._connect = root.attrib["connect"]
-        attr._data = json.loads(root.text)
+        attr._data = jsonLoads(root.text)
 
         # additional data
         attr._expression = attr._data.pop("_expression", "")
@@ -700,17 +700,15 @@ class Module(object):
         
         return attr
 
-    def getEnv(self):        
-        env = dict(ModulesAPI)
-        env.update({"module": self, 
-                    "ch": self.ch, 
-                    "chdata": self.chdata, 
-                    "chset": self.chset})
-        return env
+    def getEnv(self): # a single dict build on top of ModulesAPI
+        return dict(ModulesAPI,
+                    module=self,
+                    ch=self.ch,
+                    chdata=self.chdata,
+                    chset=self.chset)
 
     def run(self, *, uiCallback=None):
-        localEnv = dict(Module.env or {})
-        localEnv.update(self.getEnv())
+        localEnv = {**(Module.env or {}), **self.getEnv()}
 
         attrPrefix = "attr_"
         for attr in self._attributes:
@@ -5,7 +5,7 @@ import json
 import re
 import os
 
-from .utils import clamp, getActions, centerWindow, setActionsLocalShortcut, SimpleUndo, SearchReplaceDialog, JsonColors, findUniqueName
+from .utils import clamp, getActions, centerWindow, setActionsLocalShortcut, SimpleUndo, SearchReplaceDialog, JsonColors, findUniqueName, jsonLoads, disabledUpdatesContext
 
 RootDirectory = os.path.dirname(__file__)
 
@@ -47,14 +47,14 @@ class EditJsonTextWindow(QDialog):
 
     def prettyPrintToggled(self, value):
         try:
-            data = json.loads(self.textWidget.toPlainText())
+            data = jsonLoads(self.textWidget.toPlainText())
             self.textWidget.setPlainText(json.dumps(data, indent=4 if value else None))
         except:
             pass
 
     def saveAndClose(self):
         try:
-            data = json.loads(self.textWidget.toPlainText())
+            data = jsonLoads(self.textWidget.toPlainText())
             self.saved.emit(data)
             self.accept()
         except:
@@ -71,6 +71,13 @@ class JsonItem(QTreeWidgetItem):
 
     KeyRole = Qt.UserRole + 1
 
+    ForegroundColors = {NoneType: JsonColors["none"],
+                        IntType:  JsonColors["int"],
+                        FloatType: JsonColors["float"],
+                        StringType: JsonColors["string"],
+                        ListType: JsonColors["list"],
+                        DictType: JsonColors["dict"]}
+
     def __init__(self, jsonType, data=None):
         super().__init__()
 
@@ -95,6 +102,9 @@ class JsonItem(QTreeWidgetItem):
             item.addChild(self.child(i).clone())
         return item
 
+    def childKeys(self):
+        return {self.child(i).data(0, self.KeyRole) for i in range(self.childCount())}
+
     def setData(self, _, role, value):
         if role == Qt.EditRole:
             self._editValue = value
@@ -106,14 +116,7 @@ class JsonItem(QTreeWidgetItem):
             if self.jsonType == self.BoolType:
                 return JsonColors["true"] if self._editValue else JsonColors["false"]
             else:
-                colors = {self.NoneType: JsonColors["none"],
-                          self.IntType:  JsonColors["int"],
-                          self.FloatType: JsonColors["float"],
-                          self.StringType: JsonColors["string"],
-                          self.ListType: JsonColors["list"],
-                          self.DictType: JsonColors["dict"]}
-
-                return colors.get(self.jsonType, Qt.gray)
+                return self.ForegroundColors.get(self.jsonType, Qt.gray)
         
         if role == Qt.ToolTipRole:
             return str(self._editValue or "")
@@ -133,12 +136,7 @@ class JsonItem(QTreeWidgetItem):
 
                 childCount = self.childCount()
                 maxChildKeys = 10
-                children = []
-                for i in range(childCount):
-                    if i >= maxChildKeys:
-                        break
-                    k = self.child(i).data(0, self.KeyRole)
-                    children.append(k)
+                children = [QTreeWidgetItem.data(self.child(i), 0, self.KeyRole) for i in range(min(childCount, maxChildKeys))] # keys are plain item data, skip the role dispatch above
                     
                 items = ",".join(children)
                 suffix = "..." if childCount > maxChildKeys else ""
@@ -174,6 +172,8 @@ class JsonItem(QTreeWidgetItem):
         
         return path
     
+JsonValueTypes = {bool: JsonItem.BoolType, int: JsonItem.IntType, float: JsonItem.FloatType, str: JsonItem.StringType}
+
 class FloatEditor(QDoubleSpinBox):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -314,14 +314,17 @@ class JsonWidget(QTreeWidget):
         menu.popup(event.globalPos())
 
     def findItemsByType(self, jsonTypes, parent=None, *, recursive=True):
-        items = []
+        jsonTypes = frozenset(jsonTypes)
         parent = parent or self.invisibleRootItem()
-        for i in range(parent.childCount()):
-            item = parent.child(i)
+
+        items = []
+        stack = [parent.child(i) for i in range(parent.childCount()-1, -1, -1)] # reversed, so items come out in tree order
+        while stack:
+            item = stack.pop()
             if not jsonTypes or item.jsonType in jsonTypes:
                 items.append(item)
             if recursive:
-                items.extend(self.findItemsByType(jsonTypes, item, recursive=True))
+                stack.extend(item.child(i) for i in range(item.childCount()-1, -1, -1))
         return items
     
     def copyPath(self):
@@ -367,8 +370,7 @@ class JsonWidget(QTreeWidget):
             if key is not None:
                 newKey, ok = QInputDialog.getText(self, "Edit key", "Key:", text=key)
                 if ok:
-                    existingKeys = set([item.parent().child(i).data(0, item.KeyRole) for i in range(item.parent().childCount())])
-                    newKey = findUniqueName(newKey, existingKeys)
+                    newKey = findUniqueName(newKey, item.parent().childKeys())
                     item.setData(0, item.KeyRole, newKey)
 
                     # undo
@@ -405,21 +407,21 @@ class JsonWidget(QTreeWidget):
                 data = self.toJsonList()
 
             with open(path, "w") as f:
-                json.dump(data, f)
+                f.write(json.dumps(data)) # json.dump streams through the pure Python encoder, dumps uses the C one
 
     def loadFromFile(self):
         path, _ = QFileDialog.getOpenFileName(self, "Load JSON", "", "JSON (*.json)")
         if path:
             self.clear()
             with open(path, "r") as f:
-                d = json.load(f)
+                d = jsonLoads(f.read())
                 self.loadFromJsonList([d])
 
     def importFile(self):
         path, _ = QFileDialog.getOpenFileName(self, "Import JSON", "", "JSON (*.json)")
         if path:
             with open(path, "r") as f:
-                d = json.load(f)
+                d = jsonLoads(f.read())
                 self.loadFromJsonList([d])
 
     def setRootItem(self, item=None):
@@ -477,17 +479,18 @@ class JsonWidget(QTreeWidget):
                     newData = [newData]
 
                 oldData = self.toJsonList()
-                self.clear()
-                for d in newData:
-                    item = self.itemFromJson(d)
-                    self.addTopLevelItem(item)
-                    self.itemChanged.emit(item, 0)
+                with disabledUpdatesContext(self):
+                    self.clear()
+                    for d in newData:
+                        item = self.itemFromJson(d)
+                        self.addTopLevelItem(item)
+                        self.itemChanged.emit(item, 0)
 
                 # undo
                 def f():
-                    self.clear()
-                    for d in oldData:
-                        self.addTopLevelItem(self.itemFromJson(d))
+                    with disabledUpdatesContext(self):
+                        self.clear()
+                        self.addTopLevelItems([self.itemFromJson(d) for d in oldData])
                 self._undoSystem.push("EditData", f)
 
         item = item or self.selectedItem()
@@ -499,10 +502,11 @@ class JsonWidget(QTreeWidget):
 
     def moveItem(self, direction):
         selectedItems = self.selectedItems()
-        sortedItems = sorted(selectedItems, key=lambda x: -direction*(x.parent() or self.invisibleRootItem()).indexOfChild(x)) # the lowest first
+        indices = self.childIndices(selectedItems)
+        sortedItems = sorted(selectedItems, key=lambda x: -direction*indices[id(x)]) # the lowest first
 
         # undo
-        _items = [((item.parent() or self.invisibleRootItem()).indexOfChild(item), item) for item in sortedItems] # save indices
+        _items = [(indices[id(item)], item) for item in sortedItems] # save indices
         def f():
             for idx, item in _items if direction > 0 else _items[::-1]:
                 parentItem = item.parent() or self.invisibleRootItem()
@@ -514,7 +518,7 @@ class JsonWidget(QTreeWidget):
             parentItem = item.parent() or self.invisibleRootItem()
 
             expand = item.isExpanded()
-            idx = parentItem.indexOfChild(item)
+            idx = indices[id(item)] # still valid, the items moved before only shift their own side of this one
             parentItem.takeChild(idx)
             parentItem.insertChild(clamp(idx+direction, 0, parentItem.childCount()), item)
             item.setSelected(True)
@@ -526,16 +530,15 @@ class JsonWidget(QTreeWidget):
         undo_functions = []
 
         for item in items or self.selectedItems():
-            children = [item.takeChild(0) for _ in range(item.childCount())]
-            sortedChildren = sorted(children, key=lambda x: x.text(0))
-            for i, child in enumerate(sortedChildren):
-                item.insertChild(i, child)
+            with disabledUpdatesContext(self):
+                children = item.takeChildren()
+                item.addChildren(sorted(children, key=lambda x: x.text(0)))
             
             # undo
-            def f():
-                _ = [item.takeChild(0) for _ in range(item.childCount())]
-                for i, child in enumerate(children):
-                    item.insertChild(i, child)
+            def f(item=item, children=children):
+                with disabledUpdatesContext(self):
+                    item.takeChildren()
+                    item.addChildren(children)
             undo_functions.append(f)
 
         f = lambda: [f() for f in undo_functions]
@@ -569,13 +572,16 @@ class JsonWidget(QTreeWidget):
         self._undoSystem.endEditBlock()
 
     def pasteItem(self):
-        parentItem = self.selectedItem()
+        parentItem = self.selectedItem() or self.itemFromIndex(self.rootIndex())
+        existingKeys = parentItem.childKeys() if parentItem and parentItem.jsonType == parentItem.DictType else None # collected once, addItem keeps it up to date
+
         self._undoSystem.beginEditBlock("Paste")
-        for json in self._clipboard:
-            self.addItem(json, parentItem)
+        with disabledUpdatesContext(self):
+            for json in self._clipboard:
+                self.addItem(json, parentItem, existingKeys=existingKeys)
         self._undoSystem.endEditBlock()
 
-    def addItem(self, json, parentItem=None, *, insertIndex=None):
+    def addItem(self, json, parentItem=None, *, insertIndex=None, existingKeys=None):
         if not parentItem:
             parentItem = self.itemFromIndex(self.rootIndex())
 
@@ -583,8 +589,10 @@ class JsonWidget(QTreeWidget):
 
         if parentItem and parentItem is not self.invisibleRootItem():
             if parentItem.jsonType == parentItem.DictType:
-                existingKeys = set([parentItem.child(i).data(0, parentItem.KeyRole) for i in range(parentItem.childCount())])
+                if existingKeys is None:
+                    existingKeys = parentItem.childKeys()
                 key = findUniqueName("key", existingKeys)
+                existingKeys.add(key)
                 item.setData(0, item.KeyRole, key)
             elif parentItem.jsonType != parentItem.ListType:
                 return
@@ -610,12 +618,13 @@ class JsonWidget(QTreeWidget):
         selectedItems = self.selectedItems()
 
         # add undo
+        selectedIds = {id(item) for item in selectedItems}
         parentItems = []
         for item in selectedItems:
             parent = item.parent()
             skip = False
             while parent:
-                if parent in selectedItems:
+                if id(parent) in selectedIds:
                     skip = True
                     break
                 parent = parent.parent()
@@ -623,11 +632,11 @@ class JsonWidget(QTreeWidget):
             if not skip:
                 parentItems.append(item)            
 
+        indices = self.childIndices(parentItems)
         _undoData = []        
         for item in parentItems:
             parent = item.parent() or self.invisibleRootItem()
-            idx = parent.indexOfChild(item)
-            _undoData.append([self.getPathIndex(parent), item.clone(), idx])
+            _undoData.append([self.getPathIndex(parent), item.clone(), indices[id(item)]])
 
         def f():
             for parentIdx, item, idx in _undoData:
@@ -639,6 +648,16 @@ class JsonWidget(QTreeWidget):
             (item.parent() or self.invisibleRootItem()).removeChild(item)
             self.itemRemoved.emit(item)
 
+    def childIndices(self, items): # id(item) -> index in its parent, each parent is scanned once
+        indices = {}
+        parents = {} # keeps the parent wrappers alive so their ids stay unique
+        for item in items:
+            parent = item.parent() or self.invisibleRootItem()
+            if id(parent) not in parents:
+                parents[id(parent)] = parent
+                indices.update((id(parent.child(i)), i) for i in range(parent.childCount()))
+        return indices
+
     def getPathIndex(self, item): # auxiliary function for undo system
         parent = item.parent()
         if not parent:
@@ -658,29 +677,34 @@ class JsonWidget(QTreeWidget):
     
     def expandItem(self, item, value=None, *, recursive=True):
         v = not item.isExpanded() if value is None else value
-        if item and item is not self.invisibleRootItem():
-            if item.jsonType == item.DictType or (item.jsonType == item.ListType and item.childCount() < 10):
-                item.setExpanded(v)
-
-        if recursive:
-            for i in range(item.childCount()):
-                self.expandItem(item.child(i), v, recursive=True)
+        rootItem = self.invisibleRootItem()
+
+        items = [item] # walk the subtree from a stack, not by recursion
+        with disabledUpdatesContext(self):
+            while items:
+                item = items.pop()
+                if item is not rootItem:
+                    if item.jsonType == item.DictType or (item.jsonType == item.ListType and item.childCount() < 10):
+                        item.setExpanded(v)
+
+                if recursive:
+                    items.extend(item.child(i) for i in range(item.childCount()))
+                else:
+                    break
 
     def toJsonList(self):
         return [self.itemToJson(self.topLevelItem(i)) for i in range(self.topLevelItemCount())]
 
     def fromJsonList(self, dataList):
-        items = []
-        for d in dataList:
-            item = self.itemFromJson(d)
-            self.addTopLevelItem(item)
-            items.append(item)
+        items = [self.itemFromJson(d) for d in dataList]
+        self.addTopLevelItems(items)
         return items
 
     def loadFromJsonList(self, dataList):
-        newItems = self.fromJsonList(dataList)
-        for item in newItems:
-            self.expandItem(item, True)
+        with disabledUpdatesContext(self): # add and expand everything, then repaint once
+            newItems = self.fromJsonList(dataList)
+            for item in newItems:
+                self.expandItem(item, True)
         
         # undo
         def f():
@@ -692,39 +716,37 @@ class JsonWidget(QTreeWidget):
 
     def itemToJson(self, item):
         if item.jsonType == item.ListType:
-            json = []
-            for i in range(item.childCount()):
-                json.append(self.itemToJson(item.child(i)))
-            return json
+            return [self.itemToJson(item.child(i)) for i in range(item.childCount())]
 
         elif item.jsonType == item.DictType:
             json = {}
             for i in range(item.childCount()):
                 keyItem = item.child(i)
-                key = keyItem.data(0, keyItem.KeyRole)
-                json[key] = self.itemToJson(keyItem)
+                json[keyItem.data(0, keyItem.KeyRole)] = self.itemToJson(keyItem)
             return json
         
         else:
-            return item.data(0, Qt.EditRole)
+            return item._editValue # the same as data(0, Qt.EditRole) without the role dispatch
 
     def itemFromJson(self, data):
-        if type(data) == list:
+        dataType = type(data)
+
+        if dataType == list:
             item = JsonItem(JsonItem.ListType)
-            for k in data:
-                chItem = self.itemFromJson(k)
+            children = [self.itemFromJson(k) for k in data]
+            for chItem in children:
                 chItem.setFlags(chItem.flags() | Qt.ItemIsDragEnabled)
-                item.addChild(chItem)
+            item.addChildren(children) # one call instead of addChild per child
 
-        elif type(data) == dict:
+        elif dataType == dict:
             item = JsonItem(JsonItem.DictType)
+            children = []
             for k,v in data.items():
                 keyItem = self.itemFromJson(v)
                 keyItem.setData(0, keyItem.KeyRole, k)
-                item.addChild(keyItem)
+                children.append(keyItem)
+            item.addChildren(children)
         else:
-            types = {bool: JsonItem.BoolType, int: JsonItem.IntType, float: JsonItem.FloatType, str: JsonItem.StringType}            
-            jsonType = types.get(type(data), JsonItem.NoneType)
-            item = JsonItem(jsonType, data)
+            item = JsonItem(JsonValueTypes.get(dataType, JsonItem.NoneType), data)
 
         return item
@@ -1,12 +1,18 @@
 import sys
 import re
 from contextlib import contextmanager
+from functools import lru_cache
 import json
 
 from PySide2.QtGui import *
 from PySide2.QtCore import *
 from PySide2.QtWidgets import *
 
+try:
+    import orjson # optional, parses JSON several times faster
+except ImportError:
+    orjson = None
+
 JsonColors = {"none": QColor("#AAAAAA"),
               "bool": QColor("#CDEB8B"),
               "true": QColor("#82C777"),
@@ -18,22 +24,26 @@ JsonColors = {"none": QColor("#AAAAAA"),
               "dict": QColor("#7AB1CC")}
 
 def jsonColor(value):
-    if value is None:
-        return JsonColors["none"]
-    elif value is True:
+    if value is True:
         return JsonColors["true"]
     elif value is False:
-        return JsonColors["false"]    
-    elif isinstance(value, int):
-        return JsonColors["int"]
-    elif isinstance(value, float):
-        return JsonColors["float"]
-    elif isinstance(value, str):
-        return JsonColors["string"]
-    elif isinstance(value, list):
-        return JsonColors["list"]
-    elif isinstance(value, dict):
-        return JsonColors["dict"]
+        return JsonColors["false"]
+    return JsonColors.get(jsonColorName(type(value)))
+
+@lru_cache(maxsize=None)
+def jsonColorName(valueType): # the color depends on the type only, so resolve each type once
+    if valueType is type(None):
+        return "none"
+    elif issubclass(valueType, int):
+        return "int"
+    elif issubclass(valueType, float):
+        return "float"
+    elif issubclass(valueType, str):
+        return "string"
+    elif issubclass(valueType, list):
+        return "list"
+    elif issubclass(valueType, dict):
+        return "dict"
 
 def Callback(f, *args, **kwargs):
    return lambda: f(*args, **kwargs)
@@ -58,10 +68,28 @@ def replacePairs(pairs, text):
         text = re.sub(k, v, text)
     return text
 
+JsonFirstChars = frozenset('-0123456789[{"tfnNI \t\n\r') # anything else cannot start a JSON value, N and I start NaN and Infinity which jsonLoads parses with json
+
+LongIntRegexp = re.compile(r"\d{19,}") # may not fit into 64 bits, orjson would round it to a float
+
+def jsonLoads(text):
+    if orjson and not LongIntRegexp.search(text):
+        try:
+            return orjson.loads(text)
+        except ValueError: # NaN, Infinity, 1e400 and the like are accepted by json only
+            pass
+    return json.loads(text)
+
 def smartConversion(x):
+    if not isinstance(x, str): # already typed, nothing to parse
+        return x
+
+    if not x or x[0] not in JsonFirstChars: # plain text, skip the parser
+        return x
+
     try:
-        return json.loads(x)
-    except ValueError:
+        return jsonLoads(x)
+    except ValueError: # orjson.JSONDecodeError is a ValueError too
         return str(x)
 
 def fromSmartConversion(x):
@@ -122,9 +150,20 @@ def printErrorStack():
 
 @contextmanager
 def blockedWidgetContext(widget):
-    widget.blockSignals(True)
-    yield widget
-    widget.blockSignals(False)
+    blocker = QSignalBlocker(widget) # restores the previous state on unblock, so nested blocks work
+    try:
+        yield widget
+    finally:
+        blocker.unblock()
+
+@contextmanager
+def disabledUpdatesContext(widget):
+    enabled = not widget.testAttribute(Qt.WA_ForceUpdatesDisabled) # set by the widget's own setUpdatesEnabled(False) only, not inherited from a parent
+    widget.setUpdatesEnabled(False)
+    try:
+        yield widget
+    finally:
+        widget.setUpdatesEnabled(enabled)
 
 def centerWindow(window):
     screen = QDesktopWidget().screenGeometry()
@@ -134,14 +173,20 @@ def centerWindow(window):
     window.move(geom.topLeft())
 
 def clearLayout(layout):
-     if layout is not None:
-         while layout.count():
-             item = layout.takeAt(0)
-             widget = item.widget()
-             if widget is not None:
-                 widget.setParent(None)
-             else:
-                 clearLayout(item.layout())
+    layouts = [layout] # nested layouts are cleared from a stack, not by recursion
+    while layouts:
+        layout = layouts.pop()
+        if layout is None:
+            continue
+
+        while layout.count():
+            item = layout.takeAt(layout.count() - 1) # taking from the end doesn't shift the rest
+            widget = item.widget()
+            if widget is not None:
+                widget.setParent(None)
+                widget.deleteLater() # destroyed together with the others once control returns to the event loop
+            else:
+                layouts.append(item.layout())
 
 def getActions(menu, recursive=True):
     actions = []
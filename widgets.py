@@ -6,6 +6,8 @@ import sys
 import os
 import json
 import math
+import bisect
+from functools import lru_cache
 from .utils import *
 from .editor import *
 from .jsonWidget import JsonWidget
@@ -20,19 +22,50 @@ else:
 if DCC == "maya":
     import maya.cmds as cmds
 
+@lru_cache(maxsize=256) # keyed by the source, a command is compiled on its first run only
+def compileCommand(cmd):
+    try:
+        return compile(cmd, "<string>", "exec") # <string> is what printErrorStack looks for
+    except SyntaxError:
+        return cmd # let the executor report the error
+
 class TemplateWidget(QFrame):
     somethingChanged = Signal()
+    changeScheduled = Signal() # emitted right away, somethingChanged follows once control returns to the event loop
 
     def __init__(self, *, executor=None, **kwargs):
         super().__init__(**kwargs)
         self.executor = executor or self._defaultExecutor # used to execute commands
+        self._executorWords = None # cached completion words, see executorWords()
+
+        self._changeTimer = QTimer(self) # changes made in a row emit somethingChanged once
+        self._changeTimer.setSingleShot(True)
+        self._changeTimer.setInterval(0)
+        self._changeTimer.timeout.connect(self.somethingChanged.emit)
 
     def _defaultExecutor(self, cmd, env=None):
-        localEnv = dict(WidgetsAPI)
-        localEnv.update(env or {})
+        if not cmd and not env: # words probe, nothing to execute
+            return dict(WidgetsAPI) # a copy, callers must not be able to change the shared API
+
+        localEnv = dict(WidgetsAPI, **env) if env else dict(WidgetsAPI) # one copy, commands must not pollute WidgetsAPI
         exec(cmd, localEnv)
         return localEnv
 
+    def scheduleChange(self):
+        if not self.signalsBlocked(): # blocked widgets must stay silent later as well
+            self._changeTimer.start()
+            self.changeScheduled.emit()
+
+    def flushChange(self): # emit a pending change now, before the widget goes away
+        if self._changeTimer.isActive():
+            self._changeTimer.stop()
+            self.somethingChanged.emit()
+
+    def executorWords(self):
+        if self._executorWords is None:
+            self._executorWords = sorted(self.executor("").keys())
+        return self._executorWords
+
     def getDefaultData(self):
         return self.getJsonData()
 
@@ -122,13 +155,16 @@ class LabelTemplateWidget(TemplateWidget):
         layout.addWidget(self.label)
 
     def setLabelText(self, text):
+        if text == self._actualText and self.label.text():
+            return
+
         self._actualText = text
-        self.label.setText(self._actualText.replace("$ROOT", RootPath))
+        self.label.setText(text.replace("$ROOT", RootPath) if "$ROOT" in text else text)
 
     def labelDoubleClickEvent(self, event):
         def save(text):
             self.setLabelText(text)
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
         placeholder = '<img src="$ROOT/images/icons/info.png">Description'
         editTextDialog = EditTextDialog(self._actualText, title="Edit text", placeholder=placeholder)
@@ -172,14 +208,14 @@ class ButtonTemplateWidget(TemplateWidget):
         newName, ok = QInputDialog.getText(self, "Rename", "New label", QLineEdit.Normal, self.buttonWidget.text())
         if ok:
             self.buttonWidget.setText(newName)
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
     def editCommand(self):
         def save(text):
             self.buttonCommand = text
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
-        words = list(self.executor("").keys())
+        words = self.executorWords()
     
         editText = EditTextDialog(self.buttonCommand, title="Edit command", placeholder='chset("/someAttr", 1)', words=words, python=True)
         editText.saved.connect(save)
@@ -187,10 +223,7 @@ class ButtonTemplateWidget(TemplateWidget):
 
     def buttonClicked(self):
         if self.buttonCommand:
-            def f():
-                self.executor(self.buttonCommand)
-
-            f()
+            self.executor(compileCommand(self.buttonCommand))
 
     def getDefaultData(self):
         return {"command": 'chset("/someAttr", 1)',
@@ -215,7 +248,7 @@ class CheckBoxTemplateWidget(TemplateWidget):
         layout.setContentsMargins(QMargins())
 
         self.checkBox = QCheckBox()
-        self.checkBox.stateChanged.connect(lambda _=None: self.somethingChanged.emit())
+        self.checkBox.stateChanged.connect(lambda _=None: self.scheduleChange())
         layout.addWidget(self.checkBox)
 
     def getJsonData(self):
@@ -225,6 +258,11 @@ class CheckBoxTemplateWidget(TemplateWidget):
         with blockedWidgetContext(self.checkBox) as w:
             w.setChecked(value["checked"])
 
+class JsonColorDelegate(QStyledItemDelegate):
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.palette.setColor(QPalette.Text, jsonColor(smartConversion(option.text))) # colorize only visible items
+
 class ComboBoxTemplateWidget(TemplateWidget):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -233,8 +271,11 @@ class ComboBoxTemplateWidget(TemplateWidget):
         self.setLayout(layout)
         layout.setContentsMargins(QMargins())
 
+        self._itemsCache = [] # converted items kept in sync with the combo box, never read back through itemText
+
         self.comboBox = QComboBox()
-        self.comboBox.activated.connect(lambda _=None: self.somethingChanged.emit())
+        self.comboBox.setItemDelegate(JsonColorDelegate(self.comboBox))
+        self.comboBox.activated.connect(lambda _=None: self.scheduleChange())
         self.comboBox.contextMenuEvent = self.comboBoxContextMenuEvent
         layout.addWidget(self.comboBox)
 
@@ -263,49 +304,60 @@ class ComboBoxTemplateWidget(TemplateWidget):
         if ok:
             with blockedWidgetContext(self.comboBox) as w:
                 w.clear()
-            self.somethingChanged.emit()
+            self._itemsCache = []
+            self.scheduleChange()
 
     def appendItem(self):
         value, ok = QInputDialog.getText(self, "Rig Builder", "Value", QLineEdit.Normal, "")
         if ok and value:
             self.comboBox.addItem(value)
-            self.somethingChanged.emit()
+            self._itemsCache.append(smartConversion(value))
+            self.scheduleChange()
 
     def removeItem(self):
-        self.comboBox.removeItem(self.comboBox.currentIndex())
-        self.somethingChanged.emit()
+        idx = self.comboBox.currentIndex()
+        self.comboBox.removeItem(idx)
+        if 0 <= idx < len(self._itemsCache):
+            self._itemsCache.pop(idx)
+        self.scheduleChange()
 
     def getItems(self):
-        return [smartConversion(self.comboBox.itemText(i)) for i in range(self.comboBox.count())]
+        return copyJson(self._itemsCache) # callers may modify the result
     
     def setItems(self, items):
+        texts = [fromSmartConversion(item) for item in items]
+        self._itemsCache = [smartConversion(text) for text in texts] # the same values getItems would read back
+
         with blockedWidgetContext(self.comboBox) as w:
             w.clear()
+            w.addItems(texts) # one insertion into the model instead of one per item
 
-            for i, item in enumerate(items):
-                w.addItem(fromSmartConversion(item))
-                w.setItemData(i, jsonColor(item), Qt.ForegroundRole)
-
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def getDefaultData(self):
         return {"items": ["a", "b"], "current": "a", "default": "current"}
 
     def getJsonData(self):
+        idx = self.comboBox.currentIndex()
+        current = copyJson(self._itemsCache[idx]) if 0 <= idx < len(self._itemsCache) else smartConversion(self.comboBox.currentText())
         return {"items": self.getItems(),
-                "current": smartConversion(self.comboBox.currentText()),
+                "current": current,
                 "default": "current"}
 
     def setJsonData(self, value):
         items = list(value["items"])
-        
-        if value["current"] not in items:
-            items.append(value["current"]) # make sure current is in items
+        current = value["current"]
+
+        try:
+            currentIndex = items.index(current)
+        except ValueError:
+            currentIndex = len(items)
+            items.append(current) # make sure current is in items
 
         self.setItems(items)
 
         with blockedWidgetContext(self.comboBox) as w:
-            w.setCurrentIndex(items.index(value["current"]))
+            w.setCurrentIndex(currentIndex)
 
 class LineEditOptionsDialog(QDialog):
     def __init__(self, **kwargs):
@@ -350,7 +402,7 @@ class LineEditTemplateWidget(TemplateWidget):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        self.optionsDialog = LineEditOptionsDialog(parent=self)
+        self.optionsDialog = None # created on first use
         self.minValue = 0
         self.maxValue = 100
         self.validator = 0
@@ -383,7 +435,7 @@ class LineEditTemplateWidget(TemplateWidget):
 
         self.value = smartConversion(text)
         self.colorizeValue()
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def sliderValueChanged(self, v):
         v /= 100.0
@@ -391,7 +443,7 @@ class LineEditTemplateWidget(TemplateWidget):
             v = round(v)        
         self.value = v
         self.textWidget.setText(str(v))
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def textContextMenuEvent(self, event):
         menu = self.textWidget.createStandardContextMenu()
@@ -400,6 +452,9 @@ class LineEditTemplateWidget(TemplateWidget):
         menu.popup(event.globalPos())
 
     def optionsClicked(self):
+        if self.optionsDialog is None:
+            self.optionsDialog = LineEditOptionsDialog(parent=self)
+
         self.optionsDialog.minWidget.setText(str(self.minValue))
         self.optionsDialog.maxWidget.setText(str(self.maxValue))
         self.optionsDialog.validatorWidget.setCurrentIndex(self.validator)
@@ -408,7 +463,7 @@ class LineEditTemplateWidget(TemplateWidget):
         self.maxValue = int(self.optionsDialog.maxWidget.text() or LineEditTemplateWidget.defaultMax)
         self.validator = self.optionsDialog.validatorWidget.currentIndex()
         self.setupSlider()
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def getJsonData(self):
         return {"value": self.value,
@@ -458,28 +513,29 @@ class LineEditTemplateWidget(TemplateWidget):
         self.colorizeValue()
 
 class LineEditAndButtonTemplateWidget(TemplateWidget):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        defaultCmd = {"label": "<", "command": 'value = "Hello world!"'}
+    Templates = {} # shared by all instances
+    if DCC == "maya":
+        Templates["Get selected"] = {"label": "<", "command":"import maya.cmds as cmds\nls = cmds.ls(sl=True)\nif ls: value = ls[0]"}
 
-        self.templates = {}
-        if DCC == "maya":
-            self.templates["Get selected"] = {"label": "<", "command":"import maya.cmds as cmds\nls = cmds.ls(sl=True)\nif ls: value = ls[0]"}
-            defaultCmd = self.templates["Get selected"]
-
-        self.templates["Get open file"] = {"label": "...", "command":'''from PySide2.QtWidgets import QFileDialog;import os
+    Templates["Get open file"] = {"label": "...", "command":'''from PySide2.QtWidgets import QFileDialog;import os
 path,_ = QFileDialog.getOpenFileName(None, "Open file", os.path.expandvars(value))
 value = path or value'''}
 
-        self.templates["Get save file"] = {"label": "...", "command":'''from PySide2.QtWidgets import QFileDialog;import os
+    Templates["Get save file"] = {"label": "...", "command":'''from PySide2.QtWidgets import QFileDialog;import os
 path,_ = QFileDialog.getSaveFileName(None, "Save file", os.path.expandvars(value))
 value = path or value'''}
 
-        self.templates["Get existing directory"] = {"label": "...", "command":'''from PySide2.QtWidgets import QFileDialog;import os
+    Templates["Get existing directory"] = {"label": "...", "command":'''from PySide2.QtWidgets import QFileDialog;import os
 path = QFileDialog.getExistingDirectory(None, "Select directory", os.path.expandvars(value))
 value = path or value'''}
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.templates = LineEditAndButtonTemplateWidget.Templates
+        self._templatesMenu = None
+        defaultCmd = self.templates.get("Get selected", {"label": "<", "command": 'value = "Hello world!"'})
+
         self.buttonCommand = defaultCmd["command"]
         self.value = ""
 
@@ -504,7 +560,7 @@ value = path or value'''}
     def textChanged(self):
         self.value = smartConversion(self.textWidget.text().strip())
         self.colorizeValue()
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def buttonContextMenuEvent(self, event):
         menu = QMenu(self)
@@ -513,30 +569,34 @@ value = path or value'''}
         menu.addAction("Edit command", self.editCommand)
 
         if self.templates:
-            def setCommand(cmd):
-                self.buttonWidget.setText(cmd["label"])
-                self.buttonCommand = cmd["command"]
-                self.somethingChanged.emit()
+            if not self._templatesMenu: # built once, the templates don't change
+                self._templatesMenu = QMenu("Templates", self)
+                for k in self.templates:
+                    self._templatesMenu.addAction(k).setData(k)
+                self._templatesMenu.triggered.connect(lambda action: self.setTemplateCommand(action.data()))
 
-            templatesMenu = QMenu("Templates", self)
-            for k, cmd in self.templates.items():
-                templatesMenu.addAction(k, lambda cmd=cmd:setCommand(cmd))
-            menu.addMenu(templatesMenu)
+            menu.addMenu(self._templatesMenu)
 
         menu.popup(event.globalPos())
 
+    def setTemplateCommand(self, name):
+        cmd = self.templates[name]
+        self.buttonWidget.setText(cmd["label"])
+        self.buttonCommand = cmd["command"]
+        self.scheduleChange()
+
     def editLabel(self):
         newName, ok = QInputDialog.getText(self, "Rename", "New label", QLineEdit.Normal, self.buttonWidget.text())
         if ok:
             self.buttonWidget.setText(newName)
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
     def editCommand(self):
         def save(text):
             self.buttonCommand = text
-            self.somethingChanged.emit()
+            self.scheduleChange()
         
-        words = list(self.executor("").keys())
+        words = self.executorWords()
         
         editText = EditTextDialog(self.buttonCommand, title="Edit command", placeholder="Your python command...", words=words, python=True)
         editText.saved.connect(save)
@@ -544,14 +604,11 @@ value = path or value'''}
 
     def buttonClicked(self):
         if self.buttonCommand:
-            def f():
-                env = {"value": smartConversion(self.textWidget.text().strip())}
-                outEnv = self.executor(self.buttonCommand, env)
-                self.value = outEnv["value"]
-                self.textWidget.setText(fromSmartConversion(self.value))
-                self.somethingChanged.emit()
-
-            f()
+            env = {"value": smartConversion(self.textWidget.text().strip())}
+            outEnv = self.executor(compileCommand(self.buttonCommand), env)
+            self.value = outEnv["value"]
+            self.textWidget.setText(fromSmartConversion(self.value))
+            self.scheduleChange()
 
     def getJsonData(self):
         return {"value": self.value,
@@ -573,21 +630,26 @@ class ListBoxItem(QListWidgetItem):
 
     def __init__(self, value):
         super().__init__()
-        self._value = value
+        self.setValue(value)
         self.setFlags(self.flags() | Qt.ItemIsEditable)
 
     def clone(self):
         return ListBoxItem(copyJson(self._value))
+
+    def setValue(self, value):
+        self._value = value
+        self._color = jsonColor(value) # data() is called on every repaint, so cache derived values
+        self._text = fromSmartConversion(value)
     
     def data(self, role):
         if role == Qt.ForegroundRole:
-            return jsonColor(self._value)
+            return self._color
         
         elif role == Qt.DisplayRole:
-            return fromSmartConversion(self._value)
+            return self._text
         
         elif role == Qt.EditRole:
-            return fromSmartConversion(self._value) # always edit as string
+            return self._text # always edit as string
         
         elif role == ListBoxItem.ValueRole:
             return self._value
@@ -596,10 +658,10 @@ class ListBoxItem(QListWidgetItem):
 
     def setData(self, role, value):
         if role == Qt.EditRole:
-            self._value = smartConversion(value)
+            self.setValue(smartConversion(value))
 
         elif role == ListBoxItem.ValueRole:
-            self._value = value
+            self.setValue(value)
 
         super().setData(role, value)
 
@@ -607,18 +669,30 @@ class ListBoxTemplateWidget(TemplateWidget):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+        self._rowHeight = None # cached row height used by resizeWidget
+        self._textWidth = None # widest item text, None means recompute
+
         layout = QVBoxLayout()
         self.setLayout(layout)
         layout.setContentsMargins(QMargins())
 
         self.listWidget = QListWidget()
         self.listWidget.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.listWidget.itemSelectionChanged.connect(self.somethingChanged.emit)
+        self.listWidget.setUniformItemSizes(True)
+        self.listWidget.itemSelectionChanged.connect(self.scheduleChange)
         self.listWidget.itemChanged.connect(self.itemChanged)
         self.listWidget.contextMenuEvent = self.listContextMenuEvent
+        self.listWidget.installEventFilter(self)
 
         layout.addWidget(self.listWidget, alignment=Qt.AlignLeft|Qt.AlignTop)
 
+    def eventFilter(self, obj, event): # cached sizes depend on the list font and style
+        if obj is self.listWidget and event.type() in [QEvent.FontChange, QEvent.StyleChange]:
+            self._rowHeight = None
+            self._textWidth = None
+
+        return super().eventFilter(obj, event)
+
     def listContextMenuEvent(self, event):
         menu = QMenu(self)
 
@@ -628,7 +702,7 @@ class ListBoxTemplateWidget(TemplateWidget):
 
         def f():
             self.listWidget.sortItems()
-            self.somethingChanged.emit()
+            self.scheduleChange()
         menu.addAction("Sort", f)
 
         menu.addSeparator()
@@ -647,7 +721,9 @@ class ListBoxTemplateWidget(TemplateWidget):
 
     def itemChanged(self, item):
         self.listWidget.closePersistentEditor(item)
-        self.somethingChanged.emit()
+        self.scheduleChange()
+        if self._textWidth is not None:
+            self.updateTextWidth([item])
         self.resizeWidget()
 
     def editItems(self):
@@ -661,13 +737,25 @@ class ListBoxTemplateWidget(TemplateWidget):
         w.show()        
 
     def resizeWidget(self):
-        width = self.listWidget.sizeHintForColumn(0) + 50
-        height = 0
-        for i in range(self.listWidget.count()):
-            height += self.listWidget.sizeHintForRow(i)
+        count = self.listWidget.count()
+        if count and self._rowHeight is None:
+            self._rowHeight = self.listWidget.sizeHintForRow(0) # all rows are single text lines, so sample once
+
+        if self._textWidth is None:
+            self._textWidth = 0
+            self.updateTextWidth([self.listWidget.item(i) for i in range(count)])
+
+        width = self._textWidth + 50
+        height = count * (self._rowHeight or 0)
         height += 2*self.listWidget.frameWidth() + 50
         self.listWidget.setFixedSize(clamp(width, 100, 500), clamp(height, 100, 500))
 
+    def updateTextWidth(self, items):
+        fontMetrics = self.listWidget.fontMetrics()
+        padding = 2*(self.listWidget.style().pixelMetric(QStyle.PM_FocusFrameHMargin, None, self.listWidget) + 1) # item text margins, as the item delegate adds them
+        for item in items:
+            self._textWidth = max(self._textWidth, fontMetrics.width(item.text()) + padding)
+
     def selectInDCC(self, allItems=True):
         items = [self.listWidget.item(i).text() for i in range(self.listWidget.count()) if allItems or self.listWidget.item(i).isSelected()]
 
@@ -679,12 +767,17 @@ class ListBoxTemplateWidget(TemplateWidget):
             if not add:
                 with blockedWidgetContext(self.listWidget) as w:
                     w.clear()
+                self._textWidth = None
+
+            newItems = [ListBoxItem(n) for n in nodes]
+            for item in newItems:
+                self.listWidget.addItem(item)
 
-            for n in nodes:
-                self.listWidget.addItem(ListBoxItem(n))
+            if self._textWidth is not None:
+                self.updateTextWidth(newItems)
 
             self.resizeWidget()
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
         if DCC == "maya":
             nodes = [n for n in cmds.ls(sl=True)]
@@ -695,32 +788,38 @@ class ListBoxTemplateWidget(TemplateWidget):
         if ok:
             with blockedWidgetContext(self.listWidget) as w:
                 w.clear()
-            self.somethingChanged.emit()
+            self._textWidth = None
+            self.scheduleChange()
             self.resizeWidget()
 
     def appendItem(self):
-        text = "item%d"%(self.listWidget.count()+1)
-        self.listWidget.addItem(ListBoxItem(text))
+        item = ListBoxItem("item%d"%(self.listWidget.count()+1))
+        self.listWidget.addItem(item)
+        if self._textWidth is not None:
+            self.updateTextWidth([item])
         self.resizeWidget()
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def removeItem(self):
         for item in self.listWidget.selectedItems(): 
             self.listWidget.takeItem(self.listWidget.row(item))
             
+        self._textWidth = None
         self.resizeWidget()
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def getItems(self):
         return [self.listWidget.item(i).data(ListBoxItem.ValueRole) for i in range(self.listWidget.count())]
     
     def setItems(self, items):
-        with blockedWidgetContext(self.listWidget) as w:
+        with blockedWidgetContext(self.listWidget) as w, disabledUpdatesContext(w): # single repaint for the whole batch
             w.clear()
             for v in items:
                 w.addItem(ListBoxItem(v))
 
-        self.somethingChanged.emit()  
+        self._textWidth = None
+
+        self.scheduleChange()  
 
     def getDefaultData(self):
         return {"items": ["a", "b"], "current":0, "selected":[], "default": "items"}
@@ -748,6 +847,8 @@ class RadioButtonTemplateWidget(TemplateWidget):
         super().__init__(**kwargs)
 
         self.numColumns = 3
+        self._buttons = [] # in id order
+        self._checkedButton = None # the only colorized button
 
         layout = QGridLayout()
         self.setLayout(layout)
@@ -777,104 +878,253 @@ class RadioButtonTemplateWidget(TemplateWidget):
         data = self.getJsonData()
         data["columns"] = n
         self.setJsonData(data)
-        self.somethingChanged.emit()
+        self.scheduleChange()
+
+    def colorizeButtons(self, checkedButton):
+        if checkedButton is self._checkedButton:
+            return
 
-    def colorizeButtons(self):
-        for b in self.buttonsGroupWidget.buttons():
-            b.setStyleSheet("QRadioButton {background-color: #2a6931}" if b.isChecked() else "")
+        if self._checkedButton:
+            self._checkedButton.setStyleSheet("")
+        checkedButton.setStyleSheet("QRadioButton {background-color: #2a6931}")
+        self._checkedButton = checkedButton
 
     def buttonClicked(self, b):
-        self.colorizeButtons()
-        self.somethingChanged.emit()
+        self.colorizeButtons(b)
+        self.scheduleChange()
 
     def clearButtons(self):
-        clearLayout(self.layout())
+        with blockedWidgetContext(self.buttonsGroupWidget) as group:
+            for b in self._buttons:
+                group.removeButton(b)
 
-        for b in self.buttonsGroupWidget.buttons():
-            self.buttonsGroupWidget.removeButton(b)
+        self._buttons = []
+        self._checkedButton = None
+        clearLayout(self.layout())
 
     def editClicked(self):
-        items = ";".join([b.text() for b in self.buttonsGroupWidget.buttons()])
+        items = ";".join([b.text() for b in self._buttons])
         newItems, ok = QInputDialog.getText(self, "Rig Builder", "Items separated with ';'", QLineEdit.Normal, items)
         if ok and newItems:
             data = self.getJsonData()
             data["items"] = [x.strip() for x in newItems.split(";")]
             self.setJsonData(data)
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
     def getDefaultData(self):
         return {"items": ["Helpers", "Run"], "current": 0, "default": "current", "columns": self.numColumns}
 
     def getJsonData(self):
-        return {"items": [b.text() for b in self.buttonsGroupWidget.buttons()],
+        return {"items": [b.text() for b in self._buttons],
                 "current": self.buttonsGroupWidget.checkedId(),
                 "columns": self.numColumns,
                 "default": "current"}
 
     def setJsonData(self, value):
-        gridLayout = self.layout()
-        self.clearButtons()
+        with disabledUpdatesContext(self):
+            gridLayout = self.layout()
+            self.clearButtons()
+
+            self.numColumns = value["columns"]
+            gridLayout.setDefaultPositioning(self.numColumns, Qt.Horizontal)
+
+            with blockedWidgetContext(self.buttonsGroupWidget) as group:
+                for i, item in enumerate(value["items"]):
+                    button = QRadioButton(item)
+                    gridLayout.addWidget(button, i//self.numColumns, i%self.numColumns)
+
+                    group.addButton(button)
+                    group.setId(button, i)
+                    self._buttons.append(button)
+
+                if value["current"] not in range(len(value["items"])):
+                    value["current"] = 0
+
+                self._buttons[value["current"]].setChecked(True)
+
+            gridLayout.invalidate()
+            self.colorizeButtons(self._buttons[value["current"]])
+
+def contiguousRanges(indices): # [(start, count), ...] from the last range to the first, so removing them doesn't shift the rest
+    ranges = []
+    for idx in sorted(indices, reverse=True):
+        if ranges and ranges[-1][0] == idx + 1:
+            ranges[-1] = (idx, ranges[-1][1] + 1)
+        else:
+            ranges.append((idx, 1))
+    return ranges
+
+class TableModel(QAbstractTableModel):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self._header = []
+        self._rows = [] # cell texts, one list per row
+
+    def header(self):
+        return self._header
+
+    def rows(self):
+        return self._rows
+
+    def cell(self, row, column):
+        return self._rows[row][column]
+
+    def setTable(self, header, rows): # single model reset instead of per cell updates
+        self.beginResetModel()
+        self._header = list(header)
+        self._rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._header)
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
 
-        self.numColumns = value["columns"]
-        gridLayout.setDefaultPositioning(self.numColumns, Qt.Horizontal)
+    def data(self, index, role=Qt.DisplayRole):
+        if role in [Qt.DisplayRole, Qt.EditRole]:
+            return self._rows[index.row()][index.column()]
 
-        for i, item in enumerate(value["items"]):
-            button = QRadioButton(item)
-            gridLayout.addWidget(button, i//self.numColumns, i%self.numColumns)
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
 
-            self.buttonsGroupWidget.addButton(button)
-            self.buttonsGroupWidget.setId(button, i)
+        self._rows[index.row()][index.column()] = value
+        self.dataChanged.emit(index, index)
+        return True
 
-        if value["current"] not in range(len(value["items"])):
-            value["current"] = 0
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._header[section]
+        return super().headerData(section, orientation, role)
 
-        with blockedWidgetContext(self.buttonsGroupWidget) as w:
-            w.buttons()[value["current"]].setChecked(True)
-        self.colorizeButtons()
+    def setHeaderData(self, section, orientation, value, role=Qt.EditRole):
+        if orientation != Qt.Horizontal:
+            return False
+
+        self._header[section] = value
+        self.headerDataChanged.emit(orientation, section, section)
+        return True
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        return self.insertRowValues(row, [[""]*len(self._header) for _ in range(count)])
+
+    def insertRowValues(self, row, rows):
+        if row < 0 or row > len(self._rows) or not rows:
+            return False
+
+        self.beginInsertRows(QModelIndex(), row, row+len(rows)-1)
+        self._rows[row:row] = rows
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if row < 0 or count < 1 or row+count > len(self._rows):
+            return False
+
+        self.beginRemoveRows(QModelIndex(), row, row+count-1)
+        del self._rows[row:row+count]
+        self.endRemoveRows()
+        return True
+
+    def insertColumns(self, column, count, parent=QModelIndex()):
+        if column < 0 or column > len(self._header) or count < 1:
+            return False
+
+        self.beginInsertColumns(QModelIndex(), column, column+count-1)
+        self._header[column:column] = ["Untitled"]*count
+        for row in self._rows:
+            row[column:column] = [""]*count
+        self.endInsertColumns()
+        return True
+
+    def removeColumns(self, column, count, parent=QModelIndex()):
+        if column < 0 or count < 1 or column+count > len(self._header):
+            return False
+
+        self.beginRemoveColumns(QModelIndex(), column, column+count-1)
+        del self._header[column:column+count]
+        for row in self._rows:
+            del row[column:column+count]
+        self.endRemoveColumns()
+        return True
 
 class TableTemplateWidget(TemplateWidget):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+        self._bulkUpdate = False
+        self._headerHeight = None # cached vertical header size hint, see resizeWidget
+        self._menu = None # context menu, see getMenu
+
+        self._resizeRowsTimer = QTimer(self) # rows are fitted once after a batch of changes
+        self._resizeRowsTimer.setSingleShot(True)
+        self._resizeRowsTimer.setInterval(0)
+        self._resizeRowsTimer.timeout.connect(self.resizeRowsToContents)
+
         layout = QVBoxLayout()
         self.setLayout(layout)
         layout.setContentsMargins(QMargins())
 
-        self.tableWidget = QTableWidget()
-        self.tableWidget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
+        self.tableModel = TableModel()
+        self.tableModel.dataChanged.connect(self.tableDataChanged)
+
+        self.tableView = QTableView()
+        self.tableView.setModel(self.tableModel)
+        self.tableView.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
+        self.tableView.setItemDelegate(JsonColorDelegate(self.tableView))
 
-        self.tableWidget.verticalHeader().setSectionsMovable(True)
-        self.tableWidget.verticalHeader().sectionMoved.connect(self.sectionMoved)
-        self.tableWidget.horizontalHeader().setSectionsMovable(True)
-        self.tableWidget.horizontalHeader().sectionMoved.connect(self.sectionMoved)
+        self.tableView.verticalHeader().setSectionsMovable(True)
+        self.tableView.verticalHeader().sectionMoved.connect(self.sectionMoved)
+        self.tableView.verticalHeader().sectionResized.connect(self.invalidateHeaderHeight)
+        self.tableView.horizontalHeader().setSectionsMovable(True)
+        self.tableView.horizontalHeader().sectionMoved.connect(self.sectionMoved)
 
-        self.tableWidget.contextMenuEvent = self.tableContextMenuEvent
-        self.tableWidget.itemChanged.connect(self.tableItemChanged)
+        self.tableView.contextMenuEvent = self.tableContextMenuEvent
 
-        header = self.tableWidget.horizontalHeader()
+        header = self.tableView.horizontalHeader()
         if "setResizeMode" in dir(header):
             header.setResizeMode(QHeaderView.ResizeToContents)
         elif "setSectionResizeMode" in dir(header):
             header.setSectionResizeMode(QHeaderView.ResizeToContents)
 
-        self.tableWidget.horizontalHeader().sectionDoubleClicked.connect(self.sectionDoubleClicked)
+        self.tableView.horizontalHeader().sectionDoubleClicked.connect(self.sectionDoubleClicked)
 
-        layout.addWidget(self.tableWidget)
+        layout.addWidget(self.tableView)
 
     def sectionMoved(self, idx, oldIndex, newIndex):
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
-    def tableItemChanged(self, item):
-        item.setForeground(jsonColor(smartConversion(item.text())))
-        self.somethingChanged.emit()
+    def beginBulkUpdate(self): # wrap mass model changes with begin/endBulkUpdate
+        self._bulkUpdate = True
+        self.tableView.setUpdatesEnabled(False)
+
+    def endBulkUpdate(self, *, emitChanged=True): # repaint, resize and report the whole batch once
+        self._bulkUpdate = False
+        self.tableView.setUpdatesEnabled(True)
+        self.resizeWidget()
+
+        if emitChanged:
+            self.scheduleChange()
+
+    def tableDataChanged(self, topLeft, bottomRight):
+        if not self._bulkUpdate:
+            self.scheduleChange()
 
     def sectionDoubleClicked(self, column):
-        newName, ok = QInputDialog.getText(self, "Rename", "New name", QLineEdit.Normal, self.tableWidget.horizontalHeaderItem(column).text())
+        newName, ok = QInputDialog.getText(self, "Rename", "New name", QLineEdit.Normal, self.tableModel.headerData(column, Qt.Horizontal))
         if ok:
-            self.tableWidget.horizontalHeaderItem(column).setText(newName)
-            self.somethingChanged.emit()
+            self.tableModel.setHeaderData(column, Qt.Horizontal, newName)
+            self.scheduleChange()
+
+    def getMenu(self): # built once, the actions read the current cell when triggered
+        if self._menu is not None:
+            return self._menu
 
-    def tableContextMenuEvent(self, event):
         menu = QMenu(self)
 
         menu.addAction("Duplicate", self.duplicateRow)
@@ -882,119 +1132,109 @@ class TableTemplateWidget(TemplateWidget):
         menu.addSeparator()
 
         rowMenu = QMenu("Row", self)
-        rowMenu.addAction("Insert", Callback(self.insertRow, self.tableWidget.currentRow()))
-        rowMenu.addAction("Append", Callback(self.insertRow, self.tableWidget.currentRow()+1))
-
+        rowMenu.addAction("Insert", lambda: self.insertRow(self.tableView.currentIndex().row()))
+        rowMenu.addAction("Append", lambda: self.insertRow(self.tableView.currentIndex().row()+1))
         rowMenu.addSeparator()
-
-        def f():
-            for item in self.tableWidget.selectedItems():
-                self.tableWidget.removeRow(self.tableWidget.row(item))
-            self.resizeWidget()
-            self.somethingChanged.emit()
-        rowMenu.addAction("Remove", f)
-
+        rowMenu.addAction("Remove", self.removeSelectedRows)
         menu.addMenu(rowMenu)
 
         columnMenu = QMenu("Column", self)
-        columnMenu.addAction("Insert", Callback(self.insertColumn, self.tableWidget.currentColumn()))
-        columnMenu.addAction("Append", Callback(self.insertColumn, self.tableWidget.currentColumn()+1))
-
+        columnMenu.addAction("Insert", lambda: self.insertColumn(self.tableView.currentIndex().column()))
+        columnMenu.addAction("Append", lambda: self.insertColumn(self.tableView.currentIndex().column()+1))
         columnMenu.addSeparator()
-
-        def f():
-            for item in self.tableWidget.selectedItems():
-                self.tableWidget.removeColumn(self.tableWidget.column(item))
-            self.resizeWidget()
-            self.somethingChanged.emit()
-
-        columnMenu.addAction("Remove", f)
+        columnMenu.addAction("Remove", self.removeSelectedColumns)
         menu.addMenu(columnMenu)
+
         menu.addSeparator()
         menu.addAction("Clear", self.clearAll)
 
-        menu.popup(event.globalPos())
+        self._menu = menu
+        return menu
+
+    def tableContextMenuEvent(self, event):
+        self.getMenu().popup(event.globalPos())
+
+    def removeSelectedRows(self):
+        rows = set([idx.row() for idx in self.tableView.selectionModel().selectedIndexes()])
+        self.beginBulkUpdate()
+        for start, count in contiguousRanges(rows):
+            self.tableModel.removeRows(start, count)
+        self.endBulkUpdate()
+
+    def removeSelectedColumns(self):
+        columns = set([idx.column() for idx in self.tableView.selectionModel().selectedIndexes()])
+        self.beginBulkUpdate()
+        for start, count in contiguousRanges(columns):
+            self.tableModel.removeColumns(start, count)
+        self.endBulkUpdate()
+
+    def resizeRowsToContents(self):
+        self.tableView.resizeRowsToContents()
+        self.resizeWidget()
+
+    def invalidateHeaderHeight(self, *_):
+        self._headerHeight = None
 
     def resizeWidget(self):
-        height = 0
-        for i in range(self.tableWidget.rowCount()):
-            height += self.tableWidget.rowHeight(i)
+        height = self.tableView.verticalHeader().length() # sum of row heights
+
+        if self._headerHeight is None:
+            self._headerHeight = self.tableView.verticalHeader().sizeHint().height()
 
-        headerHeight = self.tableWidget.verticalHeader().sizeHint().height()
+        headerHeight = self._headerHeight
         height += headerHeight*2
-        self.tableWidget.setFixedHeight(clamp(height, headerHeight+100, 500))
+        self.tableView.setFixedHeight(clamp(height, headerHeight+100, 500))
 
     def clearAll(self):
         ok = QMessageBox.question(self, "Rig Builder", "Really remove all items?", QMessageBox.Yes and QMessageBox.No, QMessageBox.Yes) == QMessageBox.Yes
         if ok:
-            self.tableWidget.clearContents()
-            self.tableWidget.setRowCount(1)
+            header = self.tableModel.header()
+            self.tableModel.setTable(header, [[""]*len(header)])
             self.resizeWidget()
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
     def insertColumn(self, current):
-        self.tableWidget.insertColumn(current)
-        self.tableWidget.setHorizontalHeaderItem(current, QTableWidgetItem("Untitled"))
-        for r in range(self.tableWidget.rowCount()):
-            self.tableWidget.setItem(r, current, QTableWidgetItem())
+        self.tableModel.insertColumn(current)
         self.resizeWidget()
 
     def insertRow(self, current):
-        self.tableWidget.insertRow(current)
-        for c in range(self.tableWidget.columnCount()):
-            self.tableWidget.setItem(current, c, QTableWidgetItem())
+        self.tableModel.insertRow(current)
         self.resizeWidget()
 
     def duplicateRow(self):
-        newRow = self.tableWidget.currentRow()+1
-        prevRow = self.tableWidget.currentRow()
-        self.tableWidget.insertRow(newRow)
-
-        for c in range(self.tableWidget.columnCount()):
-            prevItem = self.tableWidget.item(prevRow, c)
-            self.tableWidget.setItem(newRow, c, prevItem.clone() if prevItem else QTableWidgetItem())
-
+        prevRow = self.tableView.currentIndex().row()
+        columns = range(self.tableModel.columnCount())
+        values = [self.tableModel.cell(prevRow, c) for c in columns] if prevRow >= 0 else ["" for _ in columns]
+        self.tableModel.insertRowValues(prevRow+1, [values])
         self.resizeWidget()
 
     def getDefaultData(self):
         return {"items": [("a", "1")], "header": ["name", "value"], "default": "items"}
 
     def getJsonData(self):
-        sortedColumns = sorted([c for c in range(self.tableWidget.columnCount())], key=lambda c: self.tableWidget.visualColumn(c))
-        header = [self.tableWidget.horizontalHeaderItem(c).text() for c in sortedColumns]
-
-        vheader = self.tableWidget.verticalHeader()
-        hheader = self.tableWidget.horizontalHeader()
+        vheader = self.tableView.verticalHeader()
+        hheader = self.tableView.horizontalHeader()
 
-        items = []
-        for r in range(self.tableWidget.rowCount()):
-            row = []
-            for c in range(self.tableWidget.columnCount()):
-                item = self.tableWidget.item(vheader.logicalIndex(r), hheader.logicalIndex(c))
-                row.append(smartConversion(item.text()) if item else "")
+        # logical indices in visual order, resolved once instead of per cell
+        rowOrder = [vheader.logicalIndex(r) for r in range(self.tableModel.rowCount())]
+        columnOrder = [hheader.logicalIndex(c) for c in range(self.tableModel.columnCount())]
 
-            items.append(row)
-
-        return {"items": items, "header": header, "default": "items"}
+        header = self.tableModel.header()
+        rows = self.tableModel.rows()
+        return {"items": [[smartConversion(rows[r][c]) for c in columnOrder] for r in rowOrder],
+                "header": [header[c] for c in columnOrder],
+                "default": "items"}
 
     def setJsonData(self, value):
-        self.tableWidget.setColumnCount(len(value["header"]))
-        self.tableWidget.setHorizontalHeaderLabels(value["header"])
-
-        items = value["items"]
-        self.tableWidget.setRowCount(len(items))
-        for r, row in enumerate(items):
-            for c in range(len(value["header"])): # fill each column
-                if c < len(row):
-                    data = row[c]
-                    item = QTableWidgetItem(fromSmartConversion(data))
-                    item.setForeground(jsonColor(data))
-                else:
-                    item = QTableWidgetItem()
-                self.tableWidget.setItem(r, c, item)
+        header = value["header"]
 
-        self.tableWidget.resizeRowsToContents()
+        rows = []
+        for row in value["items"]:
+            rows.append([fromSmartConversion(row[c]) if c < len(row) else "" for c in range(len(header))]) # fill each column
+
+        self.tableModel.setTable(header, rows)
         self.resizeWidget()
+        self._resizeRowsTimer.start()
 
 class TextTemplateWidget(TemplateWidget):
     def __init__(self, **kwargs):
@@ -1005,7 +1245,7 @@ class TextTemplateWidget(TemplateWidget):
         layout.setContentsMargins(QMargins())
 
         self.textWidget = QTextEdit()
-        self.textWidget.textChanged.connect(lambda _=None: self.somethingChanged.emit())
+        self.textWidget.textChanged.connect(lambda _=None: self.scheduleChange())
 
         incSizeBtn = QPushButton("+")
         incSizeBtn.setFixedSize(25, 25)
@@ -1025,11 +1265,11 @@ class TextTemplateWidget(TemplateWidget):
 
     def incSize(self):
         self.textWidget.setFixedHeight(self.textWidget.height() + 50)
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def decSize(self):
         self.textWidget.setFixedHeight(self.textWidget.height() - 50)
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def getDefaultData(self):
         return {"text": "", "height": 200, "default": "text"}
@@ -1053,6 +1293,9 @@ class VectorTemplateWidget(TemplateWidget):
         self.precision = 4
         self.widgets = []
 
+        self._menu = None # cached, rebuilt when the options it shows change
+        self._menuState = None
+
         layout = QGridLayout()        
         self.setLayout(layout)
         layout.setContentsMargins(QMargins())
@@ -1085,20 +1328,46 @@ class VectorTemplateWidget(TemplateWidget):
 
         return menu
 
+    def getMenu(self):
+        state = (self.vectorDim, self.numColumns, self.precision)
+        if self._menu is None or self._menuState != state:
+            if self._menu is not None:
+                self._menu.deleteLater()
+            self._menu = self.createMenu()
+            self._menuState = state
+        return self._menu
+
     def contextMenuEvent(self, event):
-        menu = self.createMenu()
-        menu.popup(event.globalPos())
+        self.getMenu().popup(event.globalPos())
+
+    def eventFilter(self, obj, event): # context menu of the line edits
+        if event.type() == QEvent.ContextMenu and obj in self.widgets:
+            stdMenu = obj.createStandardContextMenu()
+            stdMenu.addSeparator()
+            stdMenu.addActions(self.getMenu().actions())
+            stdMenu.popup(event.globalPos())
+            return True
+
+        return super().eventFilter(obj, event)
 
     def setSizes(self, vectorDim, numColumns):
+        if vectorDim == self.vectorDim and numColumns == self.numColumns:
+            return
+
         self.vectorDim = vectorDim
         self.numColumns = numColumns
         self.setJsonData(self.getJsonData())
-        self.somethingChanged.emit()
+        self.scheduleChange()
+
+    def setPrecision(self, prec): # the layout stays the same, so just update the existing line edits
+        if prec == self.precision:
+            return
 
-    def setPrecision(self, prec):
         self.precision = prec
-        self.setJsonData(self.getJsonData())
-        self.somethingChanged.emit()
+        for w in self.widgets:
+            w.validator().setDecimals(prec)
+            w.setText(str(round(float(w.text() or 0.0), prec)))
+        self.scheduleChange()
 
     def getDefaultData(self):
         return {"value": [0.0, 0.0, 0.0], "default": "value", "dimension": self.vectorDim, "columns": self.numColumns, "precision": self.precision}
@@ -1111,15 +1380,6 @@ class VectorTemplateWidget(TemplateWidget):
                 "columns": self.numColumns}
 
     def setJsonData(self, value):
-        def widgetContextMenu(event, w):            
-            stdMenu = w.createStandardContextMenu()
-            stdMenu.addSeparator()
-
-            menu = self.createMenu()            
-            for a in menu.actions():
-                stdMenu.addAction(a)
-            stdMenu.popup(event.globalPos())
-
         for w in self.widgets:
             w.hide()
 
@@ -1141,8 +1401,8 @@ class VectorTemplateWidget(TemplateWidget):
             v = value["value"][i] if i < len(value["value"]) else 0.0
             widget = QLineEdit(str(round(v, self.precision)))
             widget.setValidator(validator)
-            widget.editingFinished.connect(self.somethingChanged.emit)
-            widget.contextMenuEvent = lambda event, w=widget: widgetContextMenu(event, w)
+            widget.editingFinished.connect(self.scheduleChange)
+            widget.installEventFilter(self)
             layout.addWidget(widget, i//self.numColumns, i%self.numColumns)
             self.widgets.append(widget)
 
@@ -1166,14 +1426,40 @@ def evaluateBezierCurve(cvs, param):
 
     return evaluateBezier(p1, p2, p3, p4, t)
 
-def evaluateBezier(p1, p2, p3, p4, param): # De Casteljau's algorithm
-    p1_p2 = listLerp(p1, p2, param)
-    p2_p3 = listLerp(p2, p3, param)
-    p3_p4 = listLerp(p3, p4, param)
-
-    p1_p2_p2_p3 = listLerp(p1_p2, p2_p3, param)
-    p2_p3_p3_p4 = listLerp(p2_p3, p3_p4, param)
-    return listLerp(p1_p2_p2_p3, p2_p3_p3_p4, param)
+def evaluateBezier(p1, p2, p3, p4, param): # Bernstein form, no intermediate points
+    mt = 1 - param
+    mt2 = mt*mt
+    t2 = param*param
+    a = mt2*mt
+    b = 3*mt2*param
+    c = 3*mt*t2
+    d = t2*param
+    return [a*v1 + b*v2 + c*v3 + d*v4 for v1, v2, v3, v4 in zip(p1, p2, p3, p4)]
+
+def bezierCoefficients(p1, p2, p3, p4): # power basis per axis: B(t) = ((a*t + b)*t + c)*t + d
+    return [(-v1 + 3*v2 - 3*v3 + v4, 3*v1 - 6*v2 + 3*v3, -3*v1 + 3*v2, v1) for v1, v2, v3, v4 in zip(p1, p2, p3, p4)]
+
+@lru_cache(maxsize=None)
+def bezierSampleParams(count, numSegments): # (segment, t) of 'count' evenly spaced params, the same for every curve of this size
+    params = []
+    for i in range(count):
+        absParam = i / float(count - 1) * numSegments
+        offset = max(int(math.floor(absParam - 1e-5)), 0)
+        params.append((offset, absParam - offset))
+    return tuple(params)
+
+def sampleBezierCurve(cvs, count): # evaluate the curve at 'count' evenly spaced params in one pass
+    numSegments = int(math.floor((len(cvs) + 2) / 3.0) - 1)
+    coefficients = {} # by segment, computed once for all its samples
+
+    points = []
+    for offset, t in bezierSampleParams(count, numSegments):
+        coeffs = coefficients.get(offset)
+        if coeffs is None:
+            coeffs = coefficients[offset] = bezierCoefficients(*cvs[offset*3:offset*3+4])
+
+        points.append([((a*t + b)*t + c)*t + d for a, b, c, d in coeffs])
+    return points
 
 def bezierSplit(p1, p2, p3, p4, at=0.5):
     p1_p2 = listLerp(p1, p2, at)
@@ -1186,26 +1472,52 @@ def bezierSplit(p1, p2, p3, p4, at=0.5):
 
     return (p1, p1_p2, p1_p2_p2_p3, p), (p, p2_p3_p3_p4, p3_p4, p4)
 
-def findFromX(p1, p2, p3, p4, x, *, epsilon=1e-3):
-    cvs1, cvs2 = bezierSplit(p1, p2, p3, p4)
-    midp = cvs2[0]
+def findFromX(p1, p2, p3, p4, x, *, epsilon=1e-3): # solve Bx(t) = x with Newton steps, falling back to bisection
+    coeffs = bezierCoefficients(p1, p2, p3, p4) # reused for the resulting point
+    a, b, c, d = coeffs[0]
+
+    low, high = 0.0, 1.0 # x grows with t within a segment
+    t = min(max((x - p1[0]) / (p4[0] - p1[0]), 0.0), 1.0) if p4[0] != p1[0] else 0.5
+
+    for _ in range(64):
+        error = ((a*t + b)*t + c)*t + d - x
+        if abs(error) < epsilon:
+            break
+
+        if error < 0:
+            low = t
+        else:
+            high = t
+
+        derivative = (3*a*t + 2*b)*t + c
+        t = t - error / derivative if derivative else low
+        if not low < t < high: # Newton step left the bracket
+            t = (low + high) / 2
+
+    return [((a*t + b)*t + c)*t + d for a, b, c, d in coeffs]
+
+class CurveKnotsX(object): # x of the segment end points as a sequence, without copying cvs
+    def __init__(self, cvs):
+        self.cvs = cvs
+
+    def __len__(self):
+        return (len(self.cvs) + 2) // 3
 
-    if abs(midp[0] - x) < epsilon:
-        return midp
-    elif x < midp[0]:
-        return findFromX(cvs1[0], cvs1[1], cvs1[2], cvs1[3], x, epsilon=epsilon)
-    else:
-        return findFromX(cvs2[0], cvs2[1], cvs2[2], cvs2[3], x, epsilon=epsilon)
+    def __getitem__(self, idx):
+        return self.cvs[idx*3][0]
 
 def evaluateBezierCurveFromX(cvs, x, *, epsilon=1e-3):
-    x = clamp(x, 0, 1)
+    x = min(max(x, 0), 1) # clamp inlined, this is called per lookup
 
-    for i in range(0, len(cvs), 3):
-        if cvs[i][0] > x:
-            break
+    knots = CurveKnotsX(cvs)
+    i = min(max(bisect.bisect_right(knots, x), 1), len(knots) - 1) * 3 # first knot to the right of x
 
     return findFromX(cvs[i-3], cvs[i-2], cvs[i-1], cvs[i], x, epsilon=epsilon)
 
+def unitVector(x, y): # like QVector2D.normalized, a null vector stays null
+    length = math.hypot(x, y)
+    return (x / length, y / length) if length > 0 else (0.0, 0.0)
+
 def normalizedPoint(p, minX, maxX, minY, maxY):
     x = (p[0] - minX) / (maxX - minX)
     y = (p[1] - minY) / (maxY - minY)
@@ -1213,6 +1525,8 @@ def normalizedPoint(p, minX, maxX, minY, maxY):
 
 class CurvePointItem(QGraphicsItem):
     Size = 10
+    SelectedBrush = QBrush(QColor(100, 200, 100)) # shared by all points, not made per paint
+    OutlineColor = QColor(250, 250, 250)
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -1228,9 +1542,9 @@ class CurvePointItem(QGraphicsItem):
         size = CurvePointItem.Size
 
         if self.isSelected():
-            painter.setBrush(QBrush(QColor(100, 200, 100)))
+            painter.setBrush(CurvePointItem.SelectedBrush)
 
-        painter.setPen(QColor(250, 250, 250))
+        painter.setPen(CurvePointItem.OutlineColor)
         painter.drawRect(-size/2, -size/2, size, size)
 
     def itemChange(self, change, value):
@@ -1241,58 +1555,95 @@ class CurvePointItem(QGraphicsItem):
             if self.fixedX is not None:
                 value.setX(self.fixedX)
 
-            if CurveScene.MaxX > 0:
-                if value.x() < 0:
-                    value.setX(0)
+            value.setX(clamp(value.x(), *CurveScene.RangeX))
+            value.setY(clamp(value.y(), *CurveScene.RangeY))
 
-                elif value.x() > CurveScene.MaxX:
-                    value.setX(CurveScene.MaxX)
+        elif change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            self.scene().invalidateCVs()
 
-            else:
-                if value.x() > 0:
-                    value.setX(0)
+        return super().itemChange(change, value)
 
-                elif value.x() < CurveScene.MaxX:
-                    value.setX(CurveScene.MaxX)
-            # y
-            if CurveScene.MaxY > 0:
-                if value.y() < 0:
-                    value.setY(0)
+class CurvePolylineItem(QGraphicsItem): # open polyline, drawn directly without building a QPainterPath
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
 
-                elif value.y() > CurveScene.MaxY:
-                    value.setY(CurveScene.MaxY)
+        self._polygon = QPolygonF()
+        self._pen = QPen()
 
-            else:
-                if value.y() > 0:
-                    value.setY(0)
+    def setPolygon(self, polygon):
+        self.prepareGeometryChange()
+        self._polygon = polygon
+        self.update()
 
-                elif value.y() < CurveScene.MaxY:
-                    value.setY(CurveScene.MaxY)
+    def setPen(self, pen):
+        self._pen = pen
+        self.update()
 
-        return super().itemChange(change, value)
+    def boundingRect(self):
+        margin = self._pen.widthF() / 2 + 1 # the stroke and antialiasing go beyond the points
+        return self._polygon.boundingRect().adjusted(-margin, -margin, margin, margin)
+
+    def paint(self, painter, option, widget):
+        painter.setPen(self._pen)
+        painter.drawPolyline(self._polygon)
 
 class CurveScene(QGraphicsScene):
     MaxX = 300
     MaxY = -100
+    RangeX = (min(0, MaxX), max(0, MaxX)) # (low, high) whatever the sign of MaxX
+    RangeY = (min(0, MaxY), max(0, MaxY))
     DrawCurveSamples = 33
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
         self.cvs = []
+        self.curveView = None # the view to notify, set by CurveView
+        self._cvsDirty = True # cvs and samples are recalculated once per batch of changes only
+        self._samples = []
+        self._pointItems = [] # kept in x order between updates, so re-sorting is nearly linear
+
+        self._updateTimer = QTimer(self) # point moves are collected and applied once control returns to the event loop
+        self._updateTimer.setSingleShot(True)
+        self._updateTimer.setInterval(0)
+        self._updateTimer.timeout.connect(self.updateCVs)
+
+        self._curvePen = QPen(QColor(40,40,150)) # paint resources are made once, not per repaint
+        self._curvePen.setWidth(2)
+        self._gridPen = QPen(QColor(40,40,40, 70))
+        self._textPen = QPen(QColor(0, 0, 0))
+        self._gridPicture = None # see renderGrid
+
+        self._curveItem = CurvePolylineItem() # samples in scene coordinates, below the points
+        self._curveItem.setPen(self._curvePen)
+        self._curveItem.setZValue(-1)
+        self.addItem(self._curveItem)
 
         item1 = CurvePointItem()
         item1.setPos(0, CurveScene.MaxY)
         item1.fixedX = 0
-        self.addItem(item1)
+        self.addPoint(item1)
 
         item2 = CurvePointItem()
         item2.setPos(CurveScene.MaxX / 2, 0)
-        self.addItem(item2)
+        self.addPoint(item2)
 
         item3 = CurvePointItem()
         item3.fixedX = CurveScene.MaxX
         item3.setPos(CurveScene.MaxX, CurveScene.MaxY)
-        self.addItem(item3)
+        self.addPoint(item3)
+
+    def pointItems(self):
+        return list(self._pointItems)
+
+    def addPoint(self, item):
+        self.addItem(item)
+        self._pointItems.append(item)
+        self.invalidateCVs()
+
+    def removePoint(self, item):
+        self.removeItem(item)
+        self._pointItems.remove(item)
+        self.invalidateCVs()
 
     def mouseDoubleClickEvent(self, event):
         pos = event.scenePos()
@@ -1311,7 +1662,7 @@ class CurveScene(QGraphicsScene):
 
         item = CurvePointItem()
         item.setPos(pos)
-        self.addItem(item)
+        self.addPoint(item)
 
     def mousePressEvent(self, event):
         self._oldCvs = self.cvs[:]
@@ -1319,7 +1670,7 @@ class CurveScene(QGraphicsScene):
         if event.button() == Qt.RightButton:
             for item in self.selectedItems():
                 if item.fixedX is None: # don't remove tips
-                    self.removeItem(item)
+                    self.removePoint(item)
 
             event.accept()
         else:
@@ -1328,31 +1679,41 @@ class CurveScene(QGraphicsScene):
     def mouseReleaseEvent(self, event):
         super().mouseReleaseEvent(event)
 
-        self.calculateCVs()
+        self.updateCVs()
 
-        if self.cvs != self._oldCvs:
-            for view in self.views():
-                if type(view) == CurveView:
-                    view.somethingChanged.emit()
+        if self.cvs != self._oldCvs and self.curveView:
+            self.curveView.somethingChanged.emit()
+
+    def invalidateCVs(self):
+        self._cvsDirty = True
+        self._updateTimer.start()
+
+    def updateCVs(self):
+        if self._cvsDirty:
+            self.calculateCVs()
+            self._samples = sampleBezierCurve(self.cvs, CurveScene.DrawCurveSamples) if self.cvs else []
+            self._curveItem.setPolygon(QPolygonF([QPointF(x * CurveScene.MaxX, y * CurveScene.MaxY) for x, y in self._samples]))
+            self._cvsDirty = False
 
     def calculateCVs(self):
         self.cvs = []
 
-        if len(self.items()) < 2:
+        items = self._pointItems
+        if len(items) < 2:
             return
 
-        items = sorted(self.items(), key=lambda item: item.pos().x()) # sorted by x position
+        items.sort(key=lambda item: item.pos().x()) # in place, usually nothing or one point moved out of order
+        points = [(p.x(), p.y()) for p in (item.pos() for item in items)] # read positions once, then work on plain floats
 
         tangents = []
-        for i, _ in enumerate(items): # calculate tangents
+        for i, (x, y) in enumerate(points): # calculate tangents
             if i == 0:
-                tg = QVector2D(items[i+1].pos() - items[i].pos()).normalized()
-            elif i == len(items) - 1:
-                tg = QVector2D(items[i].pos() - items[i-1].pos()).normalized()
+                tg = unitVector(points[i+1][0] - x, points[i+1][1] - y)
+            elif i == len(points) - 1:
+                tg = unitVector(x - points[i-1][0], y - points[i-1][1])
             else:
-                prevy = items[i-1].pos().y()
-                nexty = items[i+1].pos().y()
-                y = items[i].pos().y()
+                prevx, prevy = points[i-1]
+                nextx, nexty = points[i+1]
                 if (y > prevy and y > nexty) or (y < prevy and y < nexty):
                     w = 1
                 else:
@@ -1363,34 +1724,40 @@ class CurveScene(QGraphicsScene):
                     w2 = d2 / s
                     w = max(w1, w2)*2 - 1 # from 0 to 1, because max(w1,w2) is always >= 0.5
                     w = w ** 4
-                tg = QVector2D(items[i+1].pos() - items[i-1].pos()).normalized() * (1-w) + QVector2D(1, 0) * w
+                tx, ty = unitVector(nextx - prevx, nexty - prevy)
+                tg = (tx * (1-w) + w, ty * (1-w))
 
             tangents.append(tg)
 
-        for i, _ in enumerate(items):
-            if i == 0:
-                continue
+        maxX, maxY = CurveScene.MaxX, CurveScene.MaxY # normalize inline, the range starts at 0
+        for i in range(1, len(points)):
+            x1, y1 = points[i-1]
+            x4, y4 = points[i]
 
-            p1 = items[i-1].pos()
-            p4 = items[i].pos()
+            d = (x4 - x1) / 3
+            tx1, ty1 = tangents[i-1]
+            tx4, ty4 = tangents[i]
 
-            d = (p4.x() - p1.x()) / 3
-            p2 = p1 + tangents[i-1].toPointF() * d
-            p3 = p4 - tangents[i].toPointF() * d
+            self.cvs.append([x1 / maxX, y1 / maxY])
+            self.cvs.append([(x1 + tx1 * d) / maxX, (y1 + ty1 * d) / maxY])
+            self.cvs.append([(x4 - tx4 * d) / maxX, (y4 - ty4 * d) / maxY])
 
-            self.cvs.append(normalizedPoint([p1.x(), p1.y()], 0, CurveScene.MaxX, 0, CurveScene.MaxY))
-            self.cvs.append(normalizedPoint([p2.x(), p2.y()], 0, CurveScene.MaxX, 0, CurveScene.MaxY))
-            self.cvs.append(normalizedPoint([p3.x(), p3.y()], 0, CurveScene.MaxX, 0, CurveScene.MaxY))
+        x, y = points[-1]
+        self.cvs.append([x / maxX, y / maxY])
 
-        self.cvs.append(normalizedPoint([p4.x(), p4.y()], 0, CurveScene.MaxX, 0, CurveScene.MaxY))
+    def drawBackground(self, painter, rect): # the curve itself is _curveItem
+        if self._gridPicture is None:
+            self._gridPicture = self.renderGrid()
+        painter.drawPicture(0, 0, self._gridPicture)
+
+    def renderGrid(self): # the background doesn't depend on the curve, so it's recorded once and replayed
+        picture = QPicture() # keeps vector commands, so it stays sharp at any view scale
+        painter = QPainter(picture)
 
-    def drawBackground(self, painter, rect):
         painter.fillRect(QRect(0,0,CurveScene.MaxX,CurveScene.MaxY), QColor(140, 140, 140))
         painter.setPen(QColor(0, 0, 0))
         painter.drawRect(QRect(0,0,CurveScene.MaxX,CurveScene.MaxY))
 
-        self.calculateCVs()
-
         font = painter.font()
         setFontSize(font, fontSize(font) - 4)        
         painter.setFont(font)
@@ -1401,11 +1768,11 @@ class CurveScene(QGraphicsScene):
         ystep = CurveScene.MaxY / GridSize
 
         for i in range(GridSize):
-            painter.setPen(QColor(40,40,40, 70))
+            painter.setPen(self._gridPen)
             painter.drawLine(i*xstep, 0, i*xstep, CurveScene.MaxY)
             painter.drawLine(0, i*ystep, CurveScene.MaxX, i*ystep)
 
-            painter.setPen(QColor(0, 0, 0))
+            painter.setPen(self._textPen)
 
             v = "%.2f"%(i/float(GridSize))
             painter.drawText(i*xstep + TextOffset, -TextOffset, v) # X axis
@@ -1413,34 +1780,8 @@ class CurveScene(QGraphicsScene):
             if i > 0:
                 painter.drawText(TextOffset, i*ystep - TextOffset, v) # Y axis
 
-        xFactor = 1.0 / CurveScene.MaxX
-        yFactor = 1.0 / CurveScene.MaxY
-
-        if not self.cvs:
-            return
-
-        pen = QPen()
-        pen.setWidth(2)
-        pen.setColor(QColor(40,40,150))
-        painter.setPen(pen)
-
-        path = QPainterPath()
-
-        p = normalizedPoint(evaluateBezierCurve(self.cvs, 0), 0, xFactor, 0, yFactor)
-        path.moveTo(p[0], p[1])
-
-        N = CurveScene.DrawCurveSamples
-        for i in range(N):
-            param = i / float(N - 1)
-            p = normalizedPoint(evaluateBezierCurve(self.cvs, param), 0, xFactor, 0, yFactor)
-
-            path.lineTo(p[0], p[1])
-            path.moveTo(p[0], p[1])
-
-        p = normalizedPoint(evaluateBezierCurve(self.cvs, 1), 0, xFactor, 0, yFactor)
-        path.lineTo(p[0], p[1])
-
-        painter.drawPath(path)
+        painter.end()
+        return picture
 
 class CurveView(QGraphicsView):
     somethingChanged = Signal()
@@ -1450,12 +1791,15 @@ class CurveView(QGraphicsView):
 
         self.setRenderHint(QPainter.Antialiasing, True)
         self.setRenderHint(QPainter.TextAntialiasing, True)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheBackground) # only the grid is there, it never changes
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
-        self.setScene(CurveScene())
+        scene = CurveScene()
+        scene.curveView = self
+        self.setScene(scene)
 
     def contextMenuEvent(self, event):
         event.accept()
@@ -1472,7 +1816,7 @@ class CurveTemplateWidget(TemplateWidget):
         self.setLayout(layout)
 
         self.curveView = CurveView()
-        self.curveView.somethingChanged.connect(self.somethingChanged.emit)
+        self.curveView.somethingChanged.connect(self.scheduleChange)
         layout.addWidget(self.curveView)
 
     def getDefaultData(self):
@@ -1481,20 +1825,38 @@ class CurveTemplateWidget(TemplateWidget):
                                           [0.6686136807168636, 0.0019357021806590401], [0.8623842449806401, 0.7231513901834298], [1.0, 1.0]]}
 
     def getJsonData(self):
-        return {"cvs": self.curveView.scene().cvs, "default": "cvs"}
+        scene = self.curveView.scene()
+        scene.updateCVs()
+        return {"cvs": scene.cvs, "default": "cvs"}
 
     def setJsonData(self, value):
         scene = self.curveView.scene()
-        scene.clear()
+        scene.updateCVs()
+        if value["cvs"] == scene.cvs: # the same curve, nothing to move
+            return
 
-        for i, (x, y) in enumerate(value["cvs"]):
-            if i % 3 == 0: # ignore tangents
+        points = [(x * CurveScene.MaxX, y * CurveScene.MaxY) for x, y in value["cvs"][::3]] # ignore tangents
+        items = sorted(scene.pointItems(), key=lambda item: item.pos().x()) # reused in place
+
+        for item in items[len(points):]:
+            scene.removePoint(item)
+
+        for i, (x, y) in enumerate(points):
+            if i < len(items):
+                item = items[i]
+                item.fixedX = None
+                item.setFlag(QGraphicsItem.ItemSendsGeometryChanges, False) # place as is, like a new item
+                item.setPos(x, y)
+                item.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+            else:
                 item = CurvePointItem()
-                item.setPos(x * CurveScene.MaxX, y * CurveScene.MaxY)
-                scene.addItem(item)
+                item.setPos(x, y)
+                scene.addPoint(item)
 
-                if i == 0 or i == len(value["cvs"]) - 1:
-                    item.fixedX = item.pos().x()
+            if i == 0 or i == len(points) - 1:
+                item.fixedX = item.pos().x()
+
+        scene.invalidateCVs()
 
 class JsonTemplateWidget(TemplateWidget):
     def __init__(self, **kwargs):
@@ -1505,13 +1867,13 @@ class JsonTemplateWidget(TemplateWidget):
         layout.setContentsMargins(QMargins())
 
         self.jsonWidget = JsonWidget()
-        self.jsonWidget.itemChanged.connect(lambda _,__:self.somethingChanged.emit())
-        self.jsonWidget.itemMoved.connect(lambda _:self.somethingChanged.emit())
-        self.jsonWidget.itemAdded.connect(lambda _:self.somethingChanged.emit())
-        self.jsonWidget.itemRemoved.connect(lambda _:self.somethingChanged.emit())
-        self.jsonWidget.dataLoaded.connect(self.somethingChanged.emit)
-        self.jsonWidget.cleared.connect(self.somethingChanged.emit)
-        self.jsonWidget.readOnlyChanged.connect(lambda _: self.somethingChanged.emit())
+        self.jsonWidget.itemChanged.connect(lambda _,__:self.scheduleChange())
+        self.jsonWidget.itemMoved.connect(lambda _:self.scheduleChange())
+        self.jsonWidget.itemAdded.connect(lambda _:self.scheduleChange())
+        self.jsonWidget.itemRemoved.connect(lambda _:self.scheduleChange())
+        self.jsonWidget.dataLoaded.connect(self.scheduleChange)
+        self.jsonWidget.cleared.connect(self.scheduleChange)
+        self.jsonWidget.readOnlyChanged.connect(lambda _: self.scheduleChange())
         self.jsonWidget.rootChanged.connect(lambda _: self.updateInfoLabel())
         self.jsonWidget.itemClicked.connect(lambda _: self.updateInfoLabel())
 
@@ -1544,11 +1906,11 @@ class JsonTemplateWidget(TemplateWidget):
 
     def incSize(self):
         self.jsonWidget.setFixedHeight(self.jsonWidget.height() + 50)
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def decSize(self):
         self.jsonWidget.setFixedHeight(self.jsonWidget.height() - 50)
-        self.somethingChanged.emit()
+        self.scheduleChange()
 
     def getDefaultData(self):
         return {"data": [{"a": 1, "b": 2}], "height":200, "readonly": False, "default": "data"}
@@ -1566,6 +1928,21 @@ class JsonTemplateWidget(TemplateWidget):
             w.loadFromJsonList(value["data"])
             w.setReadOnly(value["readonly"])
 
+TemplateIconCache = {} # template: icon rendered from a default widget, filled on demand
+TemplateDefaultDataCache = {} # template: default data, so no throwaway widget is needed each time
+
+def templateDefaultData(template):
+    if template not in TemplateDefaultDataCache:
+        TemplateDefaultDataCache[template] = TemplateWidgets[template]().getDefaultData()
+    return copyJson(TemplateDefaultDataCache[template])
+
+def templateIcon(template):
+    if template not in TemplateIconCache:
+        w = TemplateWidgets[template]()
+        w.setJsonData(w.getDefaultData())
+        TemplateIconCache[template] = QIcon(QPixmap.grabWidget(w))
+    return TemplateIconCache[template]
+
 class EditCompountWidgetsDialog(QDialog):
     saved = Signal(list) # [(template, data), ...]
 
@@ -1603,20 +1980,23 @@ class EditCompountWidgetsDialog(QDialog):
 
         addMenu = menu.addMenu("Add")
         for template in TemplateWidgets:
-            w = TemplateWidgets[template]()
-            w.setJsonData(w.getDefaultData())
-            w.template = template
-            addMenu.addAction(template, Callback(self.listWidget.addItem, self.itemFromWidget(w)))
+            addMenu.addAction(template, Callback(self.addTemplate, template))
 
         menu.addAction("Remove", lambda: self.listWidget.takeItem(self.listWidget.currentRow()))
         menu.addAction("Clear", self.listWidget.clear)    
         menu.popup(event.globalPos())
 
+    def addTemplate(self, template):
+        self.listWidget.addItem(self.createItem(template, templateDefaultData(template)))
+
     def itemFromWidget(self, w):
+        return self.createItem(w.template, w.getJsonData())
+
+    def createItem(self, template, data):
         item = QListWidgetItem()
-        item.setIcon(QIcon(QPixmap.grabWidget(w)))
-        item.setText(w.template)
-        item.setData(Qt.UserRole, w.getJsonData())        
+        item.setIcon(templateIcon(template))
+        item.setText(template)
+        item.setData(Qt.UserRole, data)
         return item
     
     def save(self):
@@ -1634,6 +2014,9 @@ class CompoundTemplateWidget(TemplateWidget):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+        self._jsonCache = None # getJsonData result, dropped as soon as any child changes
+        self._widgets = [] # children in layout order, so they are not looked up through the layout
+
         layout = QHBoxLayout()
         self.setLayout(layout)
         layout.setContentsMargins(QMargins())
@@ -1654,34 +2037,39 @@ class CompoundTemplateWidget(TemplateWidget):
                 values.append(d[d["default"]])
 
             self.setJsonData({"templates": templates, "widgets": widgets, "values": values, "default": "values"})
-            self.somethingChanged.emit()
+            self.scheduleChange()
 
         dlg = EditCompountWidgetsDialog(self)
         dlg.saved.connect(saveWidgets)
         dlg.exec_()
 
     def getWidgets(self):
-        layout = self.layout()
-        widgets = []
-        for i in range(layout.count()):
-            w = layout.itemAt(i).widget()
-            if w:                
-                widgets.append(w)
-        return widgets
+        return list(self._widgets)
 
     def getDefaultData(self):
-        d1 = ListBoxTemplateWidget().getDefaultData()
-        d2 = ButtonTemplateWidget().getDefaultData()
+        d1 = templateDefaultData("listBox")
+        d2 = templateDefaultData("button")
         return {"widgets": [d1, d2], "values": [d1[d1["default"]], d2[d2["default"]]], "templates":["listBox", "button"], "default": "values"}
 
+    def invalidateJsonCache(self):
+        self._jsonCache = None
+
+    def flushChange(self):
+        for w in self._widgets: # children forward their changes to this widget's timer
+            w.flushChange()
+        super().flushChange()
+
     def getJsonData(self):
-        values, widgets, templates = [], [], []
-        for w in self.getWidgets():
-            d = w.getJsonData()
-            templates.append(w.template)
-            values.append(d[d["default"]])
-            widgets.append(d)
-        return {"templates": templates, "widgets": widgets, "values": values, "default": "values"}
+        if self._jsonCache is None:
+            self._jsonCache = self.collectJsonData()
+        return copyJson(self._jsonCache) # callers may modify the result
+
+    def collectJsonData(self):
+        widgets = [w.getJsonData() for w in self._widgets]
+        return {"templates": [w.template for w in self._widgets],
+                "widgets": widgets,
+                "values": [d[d["default"]] for d in widgets],
+                "default": "values"}
 
     def setJsonData(self, value):
         layout = self.layout()
@@ -1690,21 +2078,28 @@ class CompoundTemplateWidget(TemplateWidget):
         templates = value["templates"]
         values = value["values"]
 
-        clearLayout(layout)
-        for i in range(len(widgets)):
-            w = TemplateWidgets[templates[i]](executor=self.executor)
-            w.template = templates[i]
+        self._jsonCache = None
+        self._widgets = []
 
-            d = dict(widgets[i])
-            d[d["default"]] = values[i]
-            w.setJsonData(d)
+        with disabledUpdatesContext(self): # relayout and repaint once, after all children are in
+            clearLayout(layout)
+            for i in range(len(widgets)):
+                w = TemplateWidgets[templates[i]](executor=self.executor)
+                w.template = templates[i]
 
-            w.somethingChanged.connect(self.somethingChanged.emit)
+                d = dict(widgets[i])
+                d[d["default"]] = values[i]
+                with blockedWidgetContext(w): # otherwise the change scheduled here fires after the connection below
+                    w.setJsonData(d)
 
-            layout.addWidget(w, alignment=Qt.AlignTop)
-            layout.addSpacing(5)
+                w.changeScheduled.connect(self.invalidateJsonCache)
+                w.somethingChanged.connect(self.scheduleChange)
 
-        layout.addStretch()
+                self._widgets.append(w)
+                layout.addWidget(w, alignment=Qt.AlignTop)
+                layout.addSpacing(5)
+
+            layout.addStretch()
 
 TemplateWidgets = {
     "button": ButtonTemplateWidget,